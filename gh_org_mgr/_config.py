@@ -18,6 +18,9 @@ APP_CONFIG_FILE = r"app\.ya?ml"
 TEAM_CONFIG_DIR = "teams"
 TEAM_CONFIG_FILES = r".+\.ya?ml"
 
+# Prefer the much faster LibYAML-based loader if PyYAML has been built with it
+_YamlSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def _find_matching_files(directory: str, pattern: str, only_one: bool = False) -> list[str]:
     """
@@ -77,7 +80,7 @@ def _read_config_file(file: str) -> dict:
     """Return dict of a YAML file"""
     logging.debug("Attempting to parse YAML file %s", file)
     with open(file, encoding="UTF-8") as yamlfile:
-        config: dict = yaml.safe_load(yamlfile)
+        config: dict = yaml.load(yamlfile, Loader=_YamlSafeLoader)
 
     if not config:
         config = {}
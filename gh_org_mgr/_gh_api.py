@@ -9,8 +9,25 @@ Functions for interacting with the GitHub API
 import logging
 import os
 import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TypeVar
 
 import requests
+from github.NamedUser import NamedUser
+from github.Organization import Organization
+from github.Requester import Requester
+from github.Team import Team
+
+# PyGithub objects that can be bound to a thread-exclusive Requester
+GhObjectT = TypeVar("GhObjectT", Organization, Team)
+
+# Storage of the Requesters that are exclusive to a thread
+_thread_requesters = threading.local()
+
+# If fewer GraphQL rate limit points remain, wait for the rate limit reset
+GRAPHQL_RATE_LIMIT_THRESHOLD = 100
 
 
 def get_github_secrets_from_env(env_variable: str, secret: str | int) -> str:
@@ -24,16 +41,104 @@ def get_github_secrets_from_env(env_variable: str, secret: str | int) -> str:
     return str(secret)
 
 
+def bind_to_current_thread(gh_object: GhObjectT) -> GhObjectT:
+    """Get a copy of a PyGithub object that makes its requests via a Requester
+    exclusive to the current thread. PyGithub shares one HTTP connection per
+    Requester, which must not be used by multiple threads at the same time.
+
+    The copy only carries the URL of the object, which is sufficient for
+    listing calls like Team.get_members() or Organization.invitations(). Only
+    use it for reading requests: PyGithub spaces write requests per Requester,
+    so writes via multiple thread-exclusive Requesters would not be spaced"""
+    base_requester = gh_object._requester  # pylint: disable=protected-access
+    requesters: dict[int, Requester] = _thread_requesters.__dict__.setdefault("by_base", {})
+    if (requester := requesters.get(id(base_requester))) is None:
+        requester = base_requester.withAuth(base_requester.auth)
+        requesters[id(base_requester)] = requester
+
+    return type(gh_object)(
+        requester=requester,
+        headers={},
+        attributes={"url": gh_object.url},
+        completed=True,
+    )
+
+
+def named_user_from_graphql(gh_object: GhObjectT, user_node: dict) -> NamedUser:
+    """Create a PyGithub user object from a GraphQL user node containing its
+    login and databaseId. It equals the user object returned by the REST API,
+    and further attributes are lazily requested using the Requester of the
+    given object"""
+    requester = gh_object._requester  # pylint: disable=protected-access
+    return NamedUser(
+        requester=requester,
+        headers={},
+        attributes={
+            "login": user_node["login"],
+            "id": user_node["databaseId"],
+            "url": f"{requester.base_url}/users/{user_node['login']}",
+        },
+        completed=False,
+    )
+
+
+def _is_rate_limited(request: requests.Response) -> bool:
+    """Check whether a request failed because of a (secondary) rate limit"""
+    return request.status_code == 429 or (
+        request.status_code == 403 and "rate limit" in request.text.lower()
+    )
+
+
+def _wait_for_graphql_rate_limit_reset(json_return: dict | str) -> None:
+    """If the query requested its rate limit information, and the remaining
+    points fall below the threshold, sleep until the rate limit is reset"""
+    if not isinstance(json_return, dict):
+        return
+    if not (rate_limit := (json_return.get("data") or {}).get("rateLimit")):
+        return
+
+    logging.debug(
+        "GraphQL query cost %s points, %s remaining (reset: %s)",
+        rate_limit["cost"],
+        rate_limit["remaining"],
+        rate_limit["resetAt"],
+    )
+    if rate_limit["remaining"] >= GRAPHQL_RATE_LIMIT_THRESHOLD:
+        return
+
+    reset_at = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00"))
+    wait = max((reset_at - datetime.now(timezone.utc)).total_seconds(), 0) + 1
+    logging.warning(
+        "Only %s GraphQL rate limit points remaining. Waiting %d seconds until the reset",
+        rate_limit["remaining"],
+        wait,
+    )
+    time.sleep(wait)
+
+
 # Function to execute GraphQL query
-def run_graphql_query(query, variables, token):
-    """Run a query against the GitHub GraphQL API"""
+def run_graphql_query(query, variables, token, retries: int = 3):
+    """Run a query against the GitHub GraphQL API. If a rate limit is hit, retry
+    with exponential backoff"""
     headers = {"Authorization": f"Bearer {token}"}
-    request = requests.post(
-        "https://api.github.com/graphql",
-        json={"query": query, "variables": variables},
-        headers=headers,
-        timeout=10,
-    )
+    for attempt in range(retries + 1):
+        request = requests.post(
+            "https://api.github.com/graphql",
+            json={"query": query, "variables": variables},
+            headers=headers,
+            timeout=10,
+        )
+        if attempt == retries or not _is_rate_limited(request):
+            break
+
+        # Wait as long as GitHub asks for, otherwise 1, 2, 4... seconds
+        wait = int(request.headers.get("Retry-After", 2**attempt))
+        logging.warning(
+            "GraphQL query hit a rate limit (HTTP error code '%s'). Retrying in %s seconds",
+            request.status_code,
+            wait,
+        )
+        time.sleep(wait)
 
     # Get JSON result
     json_return = "No valid JSON return"
@@ -43,6 +148,7 @@ def run_graphql_query(query, variables, token):
         pass
 
     if request.status_code == 200:
+        _wait_for_graphql_rate_limit_reset(json_return)
         return json_return
 
     # Debug information in case of errors
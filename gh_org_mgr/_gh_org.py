@@ -6,7 +6,11 @@
 
 import logging
 import sys
-from dataclasses import asdict, dataclass, field
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import ClassVar, Final
 
 from github import (
     Auth,
@@ -20,10 +24,42 @@ from github.Organization import Organization
 from github.Repository import Repository
 from github.Team import Team
 
-from ._gh_api import get_github_secrets_from_env, run_graphql_query
+from ._gh_api import (
+    bind_to_current_thread,
+    get_github_secrets_from_env,
+    named_user_from_graphql,
+    run_graphql_query,
+)
+
+# Configurable team settings and their fallback values. Read-only, so shared
+# by all instances
+_TEAM_CONFIG_FIELDS: Final[Mapping[str, Mapping[str, str | None]]] = MappingProxyType(
+    {
+        "parent": MappingProxyType({"fallback_value": None}),
+        "privacy": MappingProxyType({"fallback_value": "<keep-current>"}),
+        "description": MappingProxyType({"fallback_value": "<keep-current>"}),
+        "notification_setting": MappingProxyType({"fallback_value": "<keep-current>"}),
+    }
+)
+
+# Ranking of repository permissions. The lower the rank, the higher the permission
+_PERM_RANK: Final[Mapping[str, int]] = MappingProxyType(
+    {"admin": 0, "maintain": 1, "push": 2, "triage": 3, "pull": 4, "": 5}
+)
 
+# Number of items per page of paginated REST requests. This is the maximum
+# GitHub allows, PyGithub's default is only 30
+_REST_PER_PAGE: Final[int] = 100
 
-@dataclass
+# Number of users that are requested in one GraphQL query
+_USERS_PER_QUERY: Final[int] = 100
+
+# Number of repositories whose additional collaborators are requested in one
+# GraphQL query
+_REPOS_PER_COLLABORATORS_QUERY: Final[int] = 20
+
+
+@dataclass(slots=True)
 class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
     """Dataclass holding GH organization data and functions"""
 
@@ -32,29 +68,33 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
     gh_token: str = ""
     gh_app_id: str | int = ""
     gh_app_private_key: str = ""
+    gh_login: str = ""
+    concurrency: int = 8
     default_repository_permission: str = ""
     current_org_owners: list[NamedUser] = field(default_factory=list)
+    current_org_owner_logins: frozenset[str] = frozenset()
     configured_org_owners: list[str] = field(default_factory=list)
     org_members: list[NamedUser] = field(default_factory=list)
     current_teams: dict[Team, dict] = field(default_factory=dict)
+    current_teams_by_slug: dict[str, Team] = field(default_factory=dict)
+    current_teams_by_name: dict[str, Team] = field(default_factory=dict)
+    current_teams_direct_members: dict[Team, set[str]] = field(default_factory=dict)
     configured_teams: dict[str, dict | None] = field(default_factory=dict)
     newly_added_users: list[NamedUser] = field(default_factory=list)
+    resolved_users: dict[str, NamedUser | None] = field(default_factory=dict)
     current_repos_teams: dict[Repository, dict[Team, str]] = field(default_factory=dict)
-    graphql_repos_collaborators: dict[str, list[dict]] = field(default_factory=dict)
+    current_repos_by_name: dict[str, Repository] = field(default_factory=dict)
+    graphql_repos_collaborators: dict[str, dict[str, str]] = field(default_factory=dict)
+    graphql_repos_collaborators_cursors: dict[str, str] = field(default_factory=dict)
+    graphql_repos_collaborators_outdated: bool = True
     current_repos_collaborators: dict[Repository, dict[str, str]] = field(default_factory=dict)
     configured_repos_collaborators: dict[str, dict[str, str]] = field(default_factory=dict)
+    configured_teams_repo_perms: dict[str, dict[str, str]] = field(default_factory=dict)
     archived_repos: list[Repository] = field(default_factory=list)
     unconfigured_team_repo_permissions: dict[str, dict[str, str]] = field(default_factory=dict)
 
     # Re-usable Constants
-    TEAM_CONFIG_FIELDS: dict[str, dict[str, str | None]] = field(  # pylint: disable=invalid-name
-        default_factory=lambda: {
-            "parent": {"fallback_value": None},
-            "privacy": {"fallback_value": "<keep-current>"},
-            "description": {"fallback_value": "<keep-current>"},
-            "notification_setting": {"fallback_value": "<keep-current>"},
-        }
-    )
+    TEAM_CONFIG_FIELDS: ClassVar[Mapping[str, Mapping[str, str | None]]] = _TEAM_CONFIG_FIELDS
 
     # --------------------------------------------------------------------------
     # Helper functions
@@ -80,7 +120,7 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
         if self.gh_app_id and self.gh_app_private_key:
             logging.debug("Logging in via app %s", self.gh_app_id)
             auth = Auth.AppAuth(app_id=self.gh_app_id, private_key=self.gh_app_private_key)
-            app = GithubIntegration(auth=auth)
+            app = GithubIntegration(auth=auth, per_page=_REST_PER_PAGE)
             installation = app.get_org_installation(org=orgname)
             self.gh = installation.get_github_for_installation()
             logging.debug("Logged in via app installation %s", installation.id)
@@ -89,8 +129,10 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
             self.gh_token = app.get_access_token(installation_id=installation.id).token
         elif self.gh_token:
             logging.debug("Logging in as user with PAT")
-            self.gh = Github(auth=Auth.Token(self.gh_token))
-            logging.debug("Logged in as %s", self.gh.get_user().login)
+            self.gh = Github(auth=Auth.Token(self.gh_token), per_page=_REST_PER_PAGE)
+            # Remember the authenticated user, there is no such user for apps
+            self.gh_login = self.gh.get_user().login
+            logging.debug("Logged in as %s", self.gh_login)
         else:
             logging.error("No GitHub token or App ID+private key provided")
             sys.exit(1)
@@ -116,64 +158,56 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
             half2 = len(string) - half1
             return string[:half1] + "*" * (half2)
 
+        # Work on a shallow copy so that the given dictionary is not modified
+        dictionary = {**dictionary}
         sensible_keys = ["gh_token", "gh_app_private_key"]
         for key in sensible_keys:
             if value := dictionary.get(key, ""):
                 dictionary[key] = censor_half_string(value)
 
-        # Print dict nicely
-        def pretty(d, indent=0):
-            string = ""
-            for key, value in d.items():
-                string += "  " * indent + str(key) + ":\n"
+        # Print dict nicely. Collect all lines in a list and join them at the
+        # end, which is much cheaper than repeatedly concatenating strings.
+        # Nested dicts are handled with a stack of iterators instead of
+        # recursion, the stack size being the indentation level
+        lines: list[str] = []
+        stack = [iter(dictionary.items())]
+        while stack:
+            indent = "  " * (len(stack) - 1)
+            for key, value in stack[-1]:
+                lines.append(f"{indent}{key}:\n")
                 if isinstance(value, dict):
-                    string += pretty(value, indent + 1)
-                else:
-                    string += "  " * (indent + 1) + str(value) + "\n"
-
-            return string
+                    stack.append(iter(value.items()))
+                    break
+                lines.append(f"{indent}  {value}\n")
+            else:
+                stack.pop()
 
-        return pretty(dictionary)
+        return "".join(lines)
 
     def pretty_print_dataclass(self) -> str:
         """Convert this dataclass to a pretty-printed output"""
-        return self.pretty_print_dict(asdict(self))
-
-    def compare_two_lists(self, list1: list[str], list2: list[str]):
-        """
-        Compares two lists of strings and returns a tuple containing elements
-        missing in each list and common elements.
-
-        Args:
-            list1 (list of str): The first list of strings.
-            list2 (list of str): The second list of strings.
-
-        Returns:
-            tuple: A tuple containing three lists:
-                1. The first list contains elements in `list2` that are missing in `list1`.
-                2. The second list contains elements that are present in both `list1` and `list2`.
-                3. The third list contains elements in `list1` that are missing in `list2`.
-
-        Example:
-            >>> list1 = ["apple", "banana", "cherry"]
-            >>> list2 = ["banana", "cherry", "date", "fig"]
-            >>> compare_lists(list1, list2)
-            (['date', 'fig'], ['banana', 'cherry'], ['apple'])
-        """
-        # Convert lists to sets for easier comparison
-        set1, set2 = set(list1), set(list2)
 
-        # Elements in list2 that are missing in list1
-        missing_in_list1 = list(set2 - set1)
-
-        # Elements present in both lists
-        common_elements = list(set1 & set2)
-
-        # Elements in list1 that are missing in list2
-        missing_in_list2 = list(set1 - set2)
-
-        # Return the result as a tuple
-        return (missing_in_list1, common_elements, missing_in_list2)
+        # Build a shallow projection instead of using asdict(), which would
+        # deep-copy the whole PyGithub object graph. PyGithub objects are
+        # represented by their names
+        def printable(value):
+            if isinstance(value, NamedUser):
+                return value.login
+            if isinstance(value, (Team, Repository)):
+                return value.name
+            if isinstance(value, dict):
+                return {printable(k): printable(v) for k, v in value.items()}
+            if isinstance(value, (list, tuple, set, frozenset)):
+                return [printable(v) for v in value]
+            return value
+
+        return self.pretty_print_dict(
+            {
+                f.name: printable(getattr(self, f.name))
+                for f in fields(self)
+                if f.name not in ("gh", "org")
+            }
+        )
 
     def compare_two_dicts(self, dict1: dict, dict2: dict) -> dict[str, dict[str, str | int | None]]:
         """Compares two dictionaries. Assume that the keys are the same. Output
@@ -189,21 +223,69 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
 
         return differences
 
+    def _resolve_gh_usernames(self, usernames: Iterable[str]) -> None:
+        """Turn multiple usernames into GitHub user objects using the GraphQL
+        API. Each query covers multiple users by using aliases. The users are
+        stored in self.resolved_users, non-existing ones as None"""
+        unresolved = sorted({name.lower() for name in usernames} - self.resolved_users.keys())
+        for i in range(0, len(unresolved), _USERS_PER_QUERY):
+            batch = unresolved[i : i + _USERS_PER_QUERY]
+            variable_definitions = ", ".join(f"$login{idx}: String!" for idx in range(len(batch)))
+            user_queries = "".join(f"""
+                user{idx}: user(login: $login{idx}) {{
+                    login
+                    databaseId
+                }}""" for idx in range(len(batch)))
+            users_query = f"""query({variable_definitions}) {{{user_queries}
+                rateLimit {{
+                    cost
+                    remaining
+                    resetAt
+                }}
+            }}"""
+            variables = {f"login{idx}": name for idx, name in enumerate(batch)}
+
+            logging.debug("Requesting GitHub users %s", batch)
+            users_result = run_graphql_query(users_query, variables, self.gh_token)
+            # Users that do not exist are returned as null
+            for idx, name in enumerate(batch):
+                user_node = users_result["data"][f"user{idx}"]
+                self.resolved_users[name] = (
+                    named_user_from_graphql(self.org, user_node) if user_node else None
+                )
+
     def _resolve_gh_username(self, username: str, teamname: str) -> NamedUser | None:
-        """Turn a username into a proper GitHub user object"""
-        try:
-            gh_user: NamedUser = self.gh.get_user(username)  # type: ignore
-        except UnknownObjectException:
+        """Turn a username into a proper GitHub user object. Each username is
+        only requested once, the result is cached in self.resolved_users"""
+        gh_user: NamedUser | None
+        if username.lower() in self.resolved_users:
+            gh_user = self.resolved_users[username.lower()]
+        else:
+            try:
+                gh_user = self.gh.get_user(username)  # type: ignore
+            except UnknownObjectException:
+                gh_user = None
+            self.resolved_users[username.lower()] = gh_user
+
+        if gh_user is None:
             logging.error(
                 "The user '%s' configured as member of team '%s' does not "
                 "exist on GitHub. Spelling error or did they rename themselves?",
                 username,
                 teamname,
             )
-            return None
 
         return gh_user
 
+    def _get_team_by_name(self, team_name: str) -> Team:
+        """Turn a team name into a Team object. Prefer the already known teams
+        of the organisation, and only ask the API if it is not among them"""
+        if team := self.current_teams_by_name.get(team_name):
+            return team
+
+        logging.debug("Team '%s' not among the known teams, requesting it from API", team_name)
+        return self.org.get_team_by_slug(self._sluggify_teamname(team_name))
+
     # --------------------------------------------------------------------------
     # Configuration
     # --------------------------------------------------------------------------
@@ -236,21 +318,74 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
     # --------------------------------------------------------------------------
     # Owners
     # --------------------------------------------------------------------------
-    def _get_current_org_owners(self) -> None:
-        """Get all owners of the org"""
-        # Reset the user list, then build up new list
-        self.current_org_owners = []
-        for member in self.org.get_members(role="admin"):
-            self.current_org_owners.append(member)
+    def _get_current_org_owners_and_members(self) -> None:
+        """Get all owners and all ordinary members of the org using a single
+        paginated GraphQL query. Safe to be run in a thread"""
+        graphql_query = """
+            query($owner: String!, $cursor: String) {
+                organization(login: $owner) {
+                    membersWithRole(first: 100, after: $cursor) {
+                        edges {
+                            node {
+                                login
+                                databaseId
+                            }
+                            role
+                        }
+                        pageInfo {
+                            endCursor
+                            hasNextPage
+                        }
+                    }
+                }
+                rateLimit {
+                    cost
+                    remaining
+                    resetAt
+                }
+            }
+        """
+        # Build up new lists, then replace the old ones
+        owners: list[NamedUser] = []
+        members: list[NamedUser] = []
+        more_members = True
+        variables = {"owner": self.org.login, "cursor": None}
+        while more_members:
+            logging.debug("Requesting owners and members of %s", self.org.login)
+            members_with_role = run_graphql_query(graphql_query, variables, self.gh_token)["data"][
+                "organization"
+            ]["membersWithRole"]
+            for member_edge in members_with_role["edges"]:
+                user = named_user_from_graphql(self.org, member_edge["node"])
+                if member_edge["role"] == "ADMIN":
+                    owners.append(user)
+                else:
+                    members.append(user)
+            more_members = members_with_role["pageInfo"]["hasNextPage"]
+            variables["cursor"] = members_with_role["pageInfo"]["endCursor"]
+
+        self.current_org_owners = owners
+        self.org_members = members
+        # Lower-cased logins of the owners for quick comparisons
+        self.current_org_owner_logins = frozenset(
+            user.login.lower() for user in self.current_org_owners
+        )
+        # Remember the owners to avoid requesting them again
+        self.resolved_users.update((user.login.lower(), user) for user in self.current_org_owners)
 
     def _check_configured_org_owners(self) -> bool:
         """Check configured owners and make them lower-case for better
         comparison. Returns True if owners are well configured."""
-        # Add configured owners if they are a list
-        if isinstance(self.configured_org_owners, list):
-            # Make all configured users lower-case
-            self.configured_org_owners = [user.lower() for user in self.configured_org_owners]
-        else:
+        # Add configured owners if they are any kind of list. A single string
+        # is iterable as well but clearly a misconfiguration
+        try:
+            if isinstance(self.configured_org_owners, str):
+                raise TypeError
+            # Make all configured users lower-case, and remove duplicates
+            self.configured_org_owners = list(
+                dict.fromkeys(user.lower() for user in self.configured_org_owners)
+            )
+        except (TypeError, AttributeError):
             logging.warning(
                 "The organisation owners are not configured as a proper list. Will not handle them."
             )
@@ -260,7 +395,7 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
             logging.warning(
                 "No owners for your GitHub organisation configured. Will not make any "
                 "change regarding the ownership, and continue with the current owners: %s",
-                ", ".join([user.login for user in self.current_org_owners]),
+                ", ".join(user.login for user in self.current_org_owners),
             )
             return False
 
@@ -268,24 +403,23 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
 
     def _is_user_authenticated_user(self, user: NamedUser) -> bool:
         """Check if a given NamedUser is the authenticated user"""
-        if user.login == self.gh.get_user().login:
-            return True
-        return False
+        return user.login == self.gh_login
 
     def sync_org_owners(self, dry: bool = False, force: bool = False) -> None:
         """Synchronise the organization owners"""
         # Get current and configured owners
-        self._get_current_org_owners()
+        self._get_current_org_owners_and_members()
 
         # Abort owner synchronisation if no owners are configured, or badly
         if not self._check_configured_org_owners():
             return
 
         # Get differences between the current and configured owners
-        owners_remove, owners_ok, owners_add = self.compare_two_lists(
-            self.configured_org_owners, [user.login for user in self.current_org_owners]
-        )
-        # Compare configured (lower-cased) owners with lower-cased list of current owners
+        configured_owners = set(self.configured_org_owners)
+        # Compare lower-cased logins, as the configured owners are lower-cased
+        current_owners = self.current_org_owner_logins
+        owners_add = configured_owners - current_owners
+        owners_remove = current_owners - configured_owners
         if not owners_remove and not owners_add:
             logging.info("Organization owners are in sync, no changes")
             return
@@ -295,9 +429,14 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
             self.configured_org_owners,
             self.current_org_owners,
         )
-        logging.debug(
-            "Will remove %s, will not change %s, will add %s", owners_remove, owners_ok, owners_add
-        )
+        # Only calculate unchanged owners if they are actually logged
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                "Will remove %s, will not change %s, will add %s",
+                sorted(owners_remove),
+                sorted(configured_owners & current_owners),
+                sorted(owners_add),
+            )
 
         # Add the missing owners
         for user in owners_add:
@@ -337,15 +476,22 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
                     self.org.add_to_members(gh_user, "member")
 
         # Update the current organisation owners
-        self._get_current_org_owners()
+        self._get_current_org_owners_and_members()
 
     # --------------------------------------------------------------------------
     # Teams
     # --------------------------------------------------------------------------
+    def _add_current_team(self, team: Team) -> None:
+        """Register a team of the existing organisation, also by its slug and
+        name"""
+        self.current_teams[team] = {"members": {}, "repos": {}}
+        self.current_teams_by_slug[team.slug] = team
+        self.current_teams_by_name[team.name] = team
+
     def _get_current_teams(self):
         """Get teams of the existing organisation"""
-        for team in list(self.org.get_teams()):
-            self.current_teams[team] = {"members": {}, "repos": {}}
+        for team in self.org.get_teams():
+            self._add_current_team(team)
 
     def create_missing_teams(self, dry: bool = False):
         """Find out which teams are configured but not part of the org yet"""
@@ -354,53 +500,61 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
         self._get_current_teams()
 
         # Get the names of the existing teams
-        existent_team_names = [team.name for team in self.current_teams]
+        existent_team_names = {team.name for team in self.current_teams}
 
         for team, attributes in self.configured_teams.items():
             if team not in existent_team_names:
                 if parent := attributes.get("parent"):  # type: ignore
-                    parent_id = self.org.get_team_by_slug(self._sluggify_teamname(parent)).id
+                    parent_id = self._get_team_by_name(parent).id
 
                     logging.info("Creating team '%s' with parent ID '%s'", team, parent_id)
                     # NOTE: We do not specify any team settings (description etc)
                     # here, this will happen later
                     if not dry:
-                        self.org.create_team(
+                        new_team = self.org.create_team(
                             team,
                             parent_team_id=parent_id,
                             # Hardcode privacy as "secret" is not possible in child teams
                             privacy="closed",
                         )
+                        # Add new team to current teams so that child teams
+                        # configured later can find it as their parent
+                        self._add_current_team(new_team)
 
                 else:
                     logging.info("Creating team '%s' without parent", team)
                     if not dry:
-                        self.org.create_team(
+                        new_team = self.org.create_team(
                             team,
                             # Hardcode privacy as "secret" is not possible in
                             # parent teams, which is the API's default
                             privacy="closed",
                         )
+                        self._add_current_team(new_team)
 
             else:
                 logging.debug("Team '%s' already exists", team)
 
-        # Re-scan current teams as new ones may have been created
-        self._get_current_teams()
-
     def _prepare_team_config_for_sync(
-        self, team_config: dict[str, str | int | Team | None]
+        self, team_config: dict[str, str | int | Team | None], current_parent: Team | None = None
     ) -> dict[str, str | int | None]:
-        """Turn parent values into IDs, and sort the config dictionary for better comparison"""
+        """Turn parent values into IDs, and sort the config dictionary for better comparison.
+        If the configured parent is the current parent team, its ID is taken
+        without resolving the team name"""
         if parent := team_config["parent"]:
             # team coming from API request (current)
             if isinstance(parent, Team):
                 team_config["parent_team_id"] = parent.id
+            # team coming from config, and the same as the current parent
+            elif (
+                isinstance(parent, str)
+                and current_parent is not None
+                and parent == current_parent.name
+            ):
+                team_config["parent_team_id"] = current_parent.id
             # team coming from config, and valid string
             elif isinstance(parent, str) and parent:
-                team_config["parent_team_id"] = self.org.get_team_by_slug(
-                    self._sluggify_teamname(parent)
-                ).id
+                team_config["parent_team_id"] = self._get_team_by_name(parent).id
             # empty from string, so probably default value
             elif isinstance(parent, str) and not parent:
                 team_config["parent_team_id"] = None
@@ -427,28 +581,24 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
                 )
                 continue
 
-            # Use dictionary comprehensions to build the dictionaries with the
-            # relevant team settings for comparison
-            configured_team_configs = {
-                key: self.configured_teams[team.name].get(key)  # type: ignore
-                for key in self.TEAM_CONFIG_FIELDS
+            # Build the dictionaries with the relevant team settings for
+            # comparison in one pass
+            team_cfg = self.configured_teams[team.name] or {}
+            configured_team_configs: dict = {}
+            current_team_configs: dict = {}
+            for key in self.TEAM_CONFIG_FIELDS:
                 # Only add keys that are actually in the configuration. Deals
                 # with settings that should be changed, as they are neither
                 # defined in the default or team config, and marked as
-                # <keep-current>
-                if key in self.configured_teams[team.name]  # type: ignore
-            }
-            current_team_configs = {
-                key: getattr(team, key)
-                for key in self.TEAM_CONFIG_FIELDS
-                # Only compare current team settings with keys that are defined
-                # as the configured team settings. Taking out settings that
-                # shall not be changed
-                if key in self.configured_teams[team.name]  # type: ignore
-            }
+                # <keep-current>. Taking out settings that shall not be changed
+                if key in team_cfg:
+                    configured_team_configs[key] = team_cfg[key]
+                    current_team_configs[key] = getattr(team, key)
 
             # Resolve parent team id from parent Team object or team string, and sort
-            configured_team_configs = self._prepare_team_config_for_sync(configured_team_configs)
+            configured_team_configs = self._prepare_team_config_for_sync(
+                configured_team_configs, current_parent=team.parent
+            )
             current_team_configs = self._prepare_team_config_for_sync(current_team_configs)
 
             # Log the comparison result
@@ -487,12 +637,10 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
     # --------------------------------------------------------------------------
     # Members
     # --------------------------------------------------------------------------
-    def _get_current_org_members(self):
-        """Get all ordinary members of the org"""
-        # Reset the user list, then build up new list
-        self.org_members = []
-        for member in self.org.get_members(role="member"):
-            self.org_members.append(member)
+    def _get_open_invitations(self) -> set[str]:
+        """Get the lower-cased logins of all users with a pending invitation to
+        the org. Safe to be run in a thread"""
+        return {user.login.lower() for user in bind_to_current_thread(self.org).invitations()}
 
     def _get_configured_team_members(
         self, team_config: dict, team_name: str, role: str
@@ -509,17 +657,197 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
         logging.debug("Team '%s' has no configured %ss", team_name, role)
         return []
 
-    def _get_current_team_members(self, team: Team) -> dict[NamedUser, str]:
-        """Return dict of current users with their respective roles. Also
-        contains members of child teams"""
-        current_users: dict[NamedUser, str] = {}
-        for role in ("member", "maintainer"):
-            # Make a two-step check whether person is actually in team, as
-            # get_members() also return child-team members
-            for user in list(team.get_members(role=role)):
-                current_users.update({user: role})
+    def _get_current_team_role(self, login: str, graphql_role: str) -> str:
+        """Convert the GraphQL role of a team member to the REST-style role.
+        The REST API lists organisation owners as maintainers of all their
+        teams. Keep this behaviour as configured owners are treated alike"""
+        if login in self.current_org_owner_logins:
+            return "maintainer"
+        return graphql_role.lower()
+
+    def _get_current_parent_team(self, team: Team) -> Team | None:
+        """Get the parent of a team among the current teams, if any"""
+        if team.parent is None:
+            return None
+        return self.current_teams_by_slug.get(team.parent.slug)
+
+    def _add_graphql_team_members(self, team: Team, member_edges: list[dict]) -> None:
+        """Add the members of a team from a GraphQL response to the current
+        members of this team (lower-cased login) with their respective
+        (REST-style) roles"""
+        for member_edge in member_edges:
+            login = member_edge["node"]["login"].lower()
+            self.current_teams[team]["members"][login] = self._get_current_team_role(
+                login, member_edge["role"]
+            )
+            # Remember the user to avoid requesting them again, e.g. for removal
+            if login not in self.resolved_users:
+                self.resolved_users[login] = named_user_from_graphql(self.org, member_edge["node"])
+
+    def _get_current_teams_members(self) -> None:
+        """Get the current members of all teams with their respective roles
+        using the GraphQL API. Only the direct members are requested and stored
+        in self.current_teams_direct_members. As with the REST API, the members
+        of a team then also get the members of its child teams. Safe to be run
+        in a thread"""
+
+        graphql_query = """
+            query($owner: String!, $cursor: String) {
+                organization(login: $owner) {
+                    teams(first: 100, after: $cursor) {
+                        edges {
+                            node {
+                                slug
+                                members(first: 100, membership: IMMEDIATE) {
+                                    edges {
+                                        node {
+                                            login
+                                            databaseId
+                                        }
+                                        role
+                                    }
+                                    pageInfo {
+                                        endCursor
+                                        hasNextPage
+                                    }
+                                }
+                            }
+                        }
+                        pageInfo {
+                            endCursor
+                            hasNextPage
+                        }
+                    }
+                }
+                rateLimit {
+                    cost
+                    remaining
+                    resetAt
+                }
+            }
+        """
+        # Reset the members of all known teams
+        teams_by_slug: dict[str, Team] = {}
+        for team, team_attrs in self.current_teams.items():
+            team_attrs["members"] = {}
+            teams_by_slug[team.slug] = team
+
+        # dict in which we store teams with more than 100 members, and their
+        # respective end cursors
+        next_page_cursors_for_teams: dict[Team, str] = {}
 
-        return current_users
+        more_teams = True
+        variables = {"owner": self.org.login, "cursor": None}
+        while more_teams:
+            logging.debug("Requesting team members for %s", self.org.login)
+            teams = run_graphql_query(graphql_query, variables, self.gh_token)["data"][
+                "organization"
+            ]["teams"]
+            for team_edge in teams["edges"]:
+                if (team_slug := team_edge["node"]["slug"]) not in teams_by_slug:
+                    continue
+                team = teams_by_slug[team_slug]
+                members = team_edge["node"]["members"]
+                self._add_graphql_team_members(team, members["edges"])
+                if members["pageInfo"]["hasNextPage"]:
+                    next_page_cursors_for_teams[team] = members["pageInfo"]["endCursor"]
+            more_teams = teams["pageInfo"]["hasNextPage"]
+            variables["cursor"] = teams["pageInfo"]["endCursor"]
+
+        # If a team has more than 100 members, we need to fetch the rest via
+        # individual GraphQL queries. Run them in parallel, as each query only
+        # touches its own team
+        if next_page_cursors_for_teams:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                futures = [
+                    executor.submit(self._fetch_more_members_of_team, team, end_cursor)
+                    for team, end_cursor in next_page_cursors_for_teams.items()
+                ]
+                # Raise potential exceptions of the requests
+                for future in futures:
+                    future.result()
+
+        self._add_child_teams_members()
+
+    def _add_child_teams_members(self) -> None:
+        """Remember the direct members of each team. Then add them to all its
+        parent teams, as (grand-)parent teams implicitly contain the members of
+        their child teams"""
+        self.current_teams_direct_members = {
+            team: set(team_attrs["members"]) for team, team_attrs in self.current_teams.items()
+        }
+        for team, logins in self.current_teams_direct_members.items():
+            parent = self._get_current_parent_team(team)
+            while parent is not None:
+                for login in logins:
+                    self.current_teams[parent]["members"].setdefault(
+                        login, self._get_current_team_role(login, "MEMBER")
+                    )
+                parent = self._get_current_parent_team(parent)
+
+    def _fetch_more_members_of_team(self, team: Team, end_cursor: str) -> None:
+        """Fetch the remaining members of a team with more than 100 members,
+        starting after the given end cursor. Safe to be run in a thread"""
+        team_query = """
+            query($owner: String!, $team: String!, $cursor: String) {
+                organization(login: $owner) {
+                    team(slug: $team) {
+                        members(first: 100, after: $cursor, membership: IMMEDIATE) {
+                            edges {
+                                node {
+                                    login
+                                    databaseId
+                                }
+                                role
+                            }
+                            pageInfo {
+                                endCursor
+                                hasNextPage
+                            }
+                        }
+                    }
+                }
+                rateLimit {
+                    cost
+                    remaining
+                    resetAt
+                }
+            }
+        """
+        more_members_of_team = True
+        while more_members_of_team:
+            logging.debug("Requesting additional members of team %s", team.name)
+            team_variables = {"owner": self.org.login, "team": team.slug, "cursor": end_cursor}
+            members = run_graphql_query(team_query, team_variables, self.gh_token)["data"][
+                "organization"
+            ]["team"]["members"]
+            self._add_graphql_team_members(team, members["edges"])
+            more_members_of_team = members["pageInfo"]["hasNextPage"]
+            end_cursor = members["pageInfo"]["endCursor"]
+
+    def _get_configured_users_of_team(self, team_name: str) -> dict[str, str]:
+        """Get the configured members and maintainers of a team with their
+        respective role, while the maintainer role dominates. All user names
+        are lower-case to ease comparison"""
+        # Get configuration from current team
+        team_configuration = self.configured_teams.get(team_name) or {}
+
+        configured_users: dict[str, str] = {}
+        for config_role in ("member", "maintainer"):
+            team_members = self._get_configured_team_members(
+                team_configuration, team_name, config_role
+            )
+            for team_member in team_members:
+                # Add user with role to dict, in lower-case
+                configured_users.update({team_member.lower(): config_role})
+
+        # Consider all GitHub organisation team maintainers if they are member of the team
+        # This is because GitHub API returns them as maintainers even if they are just members
+        for login in self.current_org_owner_logins & configured_users.keys():
+            logging.debug("Overriding role of organisation owner '%s' to maintainer", login)
+            configured_users[login] = "maintainer"
+
+        return configured_users
 
     def _add_or_update_user_in_team(self, team: Team, user: NamedUser, role: str):
         """Add or update membership of a user in a team"""
@@ -528,25 +856,46 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
         # will later find users without team membership
         self.newly_added_users.append(user)
 
+    def _get_current_memberships(self) -> set[str]:
+        """Get all ordinary members of the org and the current members of all
+        teams. Returns the open invitations. The org members and the open
+        invitations are independent API requests, so they are run in parallel"""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            org_members = executor.submit(self._get_current_org_owners_and_members)
+            open_invitations = executor.submit(self._get_open_invitations)
+            org_members.result()
+
+        # Update current team members with dict[str (login), str (role)]. Their
+        # roles depend on the org owners, so this has to wait for them. Running
+        # it after the pool above also keeps its own pool within --concurrency
+        self._get_current_teams_members()
+
+        return open_invitations.result()
+
     def sync_teams_members(self, dry: bool = False) -> None:  # pylint: disable=too-many-branches
         """Check the configured members of each team, add missing ones and delete unconfigured"""
         logging.debug("Starting to sync team members")
 
-        # Gather all ordinary members of the organisation
-        self._get_current_org_members()
-
-        # Get open invitations
-        open_invitations = [user.login.lower() for user in self.org.invitations()]
+        # Gather all ordinary members of the organisation, all current team
+        # members, and open invitations
+        open_invitations = self._get_current_memberships()
 
+        # Get the configured users of all locally configured teams. Resolve
+        # those who are not yet member of their team in as few requests as
+        # possible, as they will have to be added
+        configured_users_of_teams: dict[Team, dict[str, str]] = {}
+        missing_users: set[str] = set()
         for team, team_attrs in self.current_teams.items():
-            # Update current team members with dict[NamedUser, str (role)]
-            team_attrs["members"] = self._get_current_team_members(team)
+            if team.name in self.configured_teams:
+                configured_users_of_teams[team] = self._get_configured_users_of_team(team.name)
+                missing_users.update(
+                    configured_users_of_teams[team].keys() - team_attrs["members"].keys()
+                )
+        self._resolve_gh_usernames(missing_users)
 
-            # For the rest of the function however, we use just the login name
-            # for each current user. All lower-case
-            current_team_members = {
-                user.login.lower(): role for user, role in team_attrs["members"].items()
-            }
+        for team, team_attrs in self.current_teams.items():
+            # The current members are stored by their lower-cased login
+            current_team_members: dict[str, str] = team_attrs["members"]
 
             # Handle the team not being configured locally
             if team.name not in self.configured_teams:
@@ -557,32 +906,7 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
                 )
                 continue
 
-            # Get configuration from current team
-            if team_configuration := self.configured_teams.get(team.name):
-                pass
-            else:
-                team_configuration = {}
-
-            # Analog to team_attrs["members"], add members and maintainers to
-            # shared dict with respective role, while maintainer role dominates.
-            # All user names shall be lower-case to ease comparison
-            configured_users: dict[str, str] = {}
-            for config_role in ("member", "maintainer"):
-                team_members = self._get_configured_team_members(
-                    team_configuration, team.name, config_role
-                )
-                for team_member in team_members:
-                    # Add user with role to dict, in lower-case
-                    configured_users.update({team_member.lower(): config_role})
-
-            # Consider all GitHub organisation team maintainers if they are member of the team
-            # This is because GitHub API returns them as maintainers even if they are just members
-            for user in self.current_org_owners:
-                if user.login in configured_users:
-                    logging.debug(
-                        "Overriding role of organisation owner '%s' to maintainer", user.login
-                    )
-                    configured_users[user.login.lower()] = "maintainer"
+            configured_users = configured_users_of_teams[team]
 
             # Only make edits to the team membership if the current state differs from config
             if configured_users == current_team_members:
@@ -639,7 +963,9 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
                         # If the user cannot be found for some reason, log an
                         # error and skip this loop
                         continue
-                    if team.has_in_members(gh_user):
+                    # Members of child teams are also listed as members of
+                    # their parent team. Only remove direct members
+                    if current_user in self.current_teams_direct_members.get(team, set()):
                         logging.info(
                             "Removing '%s' from team '%s' as they are not configured",
                             gh_user.login,
@@ -658,32 +984,206 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
     def get_members_without_team(self) -> None:
         """Get all organisation members without any team membership"""
         # Combine org owners and org members
-        all_org_members = set(self.org_members + self.current_org_owners)
+        all_org_members = {
+            user.login.lower(): user for user in self.org_members + self.current_org_owners
+        }
 
-        # Get all members of all teams
-        all_team_members_lst: list[NamedUser] = []
-        for _, team_attrs in self.current_teams.items():
-            for member in team_attrs.get("members", {}):
-                all_team_members_lst.append(member)
-        # Also add users that have just been added to a team, and unify them
-        all_team_members: set[NamedUser] = set(all_team_members_lst + self.newly_added_users)
+        # Get the lower-cased logins of all members of all teams
+        all_team_members: set[str] = set()
+        for team_attrs in self.current_teams.values():
+            all_team_members.update(team_attrs.get("members", {}))
+        # Also add users that have just been added to a team
+        all_team_members.update(user.login.lower() for user in self.newly_added_users)
 
         # Find members that are in org_members but not team_members
-        members_without_team = all_org_members.difference(all_team_members)
+        members_without_team = [
+            user for login, user in all_org_members.items() if login not in all_team_members
+        ]
 
         if members_without_team:
-            members_without_team_str = [user.login for user in members_without_team]
             logging.warning(
                 "The following members of your GitHub organisation are not member of any team: %s",
-                ", ".join(members_without_team_str),
+                ", ".join(user.login for user in members_without_team),
             )
 
     # --------------------------------------------------------------------------
     # Repos
     # --------------------------------------------------------------------------
+    def _fetch_permissions_of_organization(  # pylint: disable=too-many-locals
+        self, with_teams: bool
+    ) -> dict[str, dict[str, str]]:
+        """Get the repository permissions of all teams and the first 100
+        collaborators of all repos of the organization using the GraphQL API.
+        Both are requested in the same paginated queries. Returns a dict of repo
+        names with the team slugs and their (REST-style) permissions on this
+        repo. The collaborators are stored in self.graphql_repos_collaborators.
+
+        If with_teams is False, only the collaborators are requested"""
+
+        graphql_query = """
+            query(
+                $owner: String!,
+                $teamsCursor: String,
+                $reposCursor: String,
+                $moreTeams: Boolean!,
+                $moreRepos: Boolean!
+            ) {
+                organization(login: $owner) {
+                    teams(first: 100, after: $teamsCursor) @include(if: $moreTeams) {
+                        edges {
+                            node {
+                                slug
+                                repositories(first: 100) {
+                                    edges {
+                                        node {
+                                            name
+                                        }
+                                        permission
+                                    }
+                                    pageInfo {
+                                        endCursor
+                                        hasNextPage
+                                    }
+                                }
+                            }
+                        }
+                        pageInfo {
+                            endCursor
+                            hasNextPage
+                        }
+                    }
+                    repositories(first: 100, after: $reposCursor) @include(if: $moreRepos) {
+                        edges {
+                            node {
+                                name
+                                directCollaborators: collaborators(affiliation: DIRECT) {
+                                    totalCount
+                                }
+                                collaborators(first: 100) {
+                                    edges {
+                                        node {
+                                            login
+                                        }
+                                        permission
+                                    }
+                                    pageInfo {
+                                        endCursor
+                                        hasNextPage
+                                    }
+                                }
+                            }
+                        }
+                        pageInfo {
+                            endCursor
+                            hasNextPage
+                        }
+                    }
+                }
+                rateLimit {
+                    cost
+                    remaining
+                    resetAt
+                }
+            }
+        """
+        team_query = """
+            query($owner: String!, $team: String!, $cursor: String) {
+                organization(login: $owner) {
+                    team(slug: $team) {
+                        repositories(first: 100, after: $cursor) {
+                            edges {
+                                node {
+                                    name
+                                }
+                                permission
+                            }
+                            pageInfo {
+                                endCursor
+                                hasNextPage
+                            }
+                        }
+                    }
+                }
+                rateLimit {
+                    cost
+                    remaining
+                    resetAt
+                }
+            }
+        """
+
+        repos_team_perms: dict[str, dict[str, str]] = {}
+
+        def add_team_repo_perms(team_slug: str, repo_edges: list[dict]) -> None:
+            for repo_edge in repo_edges:
+                repos_team_perms.setdefault(repo_edge["node"]["name"], {})[team_slug] = (
+                    self._convert_graphql_perm_to_rest(repo_edge["permission"])
+                )
+
+        # dict in which we store teams with access to more than 100 repos, and
+        # their respective end cursors
+        next_page_cursors_for_teams: dict[str, str] = {}
+
+        # Reset the collaborators, and the repos for which there are more than
+        # 100 collaborators with their respective end cursors
+        self.graphql_repos_collaborators = {}
+        self.graphql_repos_collaborators_cursors = {}
+
+        variables = {
+            "owner": self.org.login,
+            "teamsCursor": None,
+            "reposCursor": None,
+            "moreTeams": with_teams,
+            "moreRepos": True,
+        }
+        while variables["moreTeams"] or variables["moreRepos"]:
+            logging.debug("Requesting repository permissions for %s", self.org.login)
+            org_result = run_graphql_query(graphql_query, variables, self.gh_token)
+            if variables["moreTeams"]:
+                teams = org_result["data"]["organization"]["teams"]
+                for team_edge in teams["edges"]:
+                    team_slug = team_edge["node"]["slug"]
+                    repositories = team_edge["node"]["repositories"]
+                    add_team_repo_perms(team_slug, repositories["edges"])
+                    if repositories["pageInfo"]["hasNextPage"]:
+                        next_page_cursors_for_teams[team_slug] = repositories["pageInfo"][
+                            "endCursor"
+                        ]
+                variables["moreTeams"] = teams["pageInfo"]["hasNextPage"]
+                variables["teamsCursor"] = teams["pageInfo"]["endCursor"]
+            if variables["moreRepos"]:
+                variables["moreRepos"], variables["reposCursor"] = (
+                    self._extract_data_from_graphql_response(
+                        graphql_response=org_result,
+                        next_page_cursors_for_repos=self.graphql_repos_collaborators_cursors,
+                    )
+                )
+
+        # The collaborators match the current state until team permissions change
+        self.graphql_repos_collaborators_outdated = False
+
+        # If a team has access to more than 100 repos, we need to fetch the rest
+        # via individual GraphQL queries
+        for team_slug, end_cursor in next_page_cursors_for_teams.items():
+            more_repos_of_team = True
+            while more_repos_of_team:
+                logging.debug("Requesting additional repository permissions of team %s", team_slug)
+                team_variables = {"owner": self.org.login, "team": team_slug, "cursor": end_cursor}
+                repositories = run_graphql_query(team_query, team_variables, self.gh_token)["data"][
+                    "organization"
+                ]["team"]["repositories"]
+                add_team_repo_perms(team_slug, repositories["edges"])
+                more_repos_of_team = repositories["pageInfo"]["hasNextPage"]
+                end_cursor = repositories["pageInfo"]["endCursor"]
+
+        return repos_team_perms
+
     def _get_current_repos_and_team_perms(self, ignore_archived: bool) -> None:
         """Get all repos, their current teams and their permissions"""
-        for repo in list(self.org.get_repos()):
+        # Get the team permissions of all repos at once instead of requesting
+        # the teams of each single repo. This also fetches the collaborators
+        repos_team_perms = self._fetch_permissions_of_organization(with_teams=True)
+        for repo in self.org.get_repos():
             # Check if repo is archived. If so, ignore it, if user requested so
             if ignore_archived and repo.archived:
                 logging.debug(
@@ -693,15 +1193,22 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
                 self.archived_repos.append(repo)
                 continue
 
+            self.current_repos_by_name[repo.name] = repo
             self.current_repos_teams[repo] = {}
-            for team in list(repo.get_teams()):
-                self.current_repos_teams[repo][team] = team.permission
+            for team_slug, permission in repos_team_perms.get(repo.name, {}).items():
+                # GraphQL returns the actual slugs, so no need to slugify them
+                if team_slug in self.current_teams_by_slug:
+                    team = self.current_teams_by_slug[team_slug]
+                else:
+                    team = self.org.get_team_by_slug(team_slug)
+                self.current_repos_teams[repo][team] = permission
 
     def _create_perms_changelist_for_teams(
         self,
     ) -> dict[Team, dict[Repository, str]]:
         """Create a permission/repo changelist from the perspective of configured teams"""
         team_changelist: dict[Team, dict[Repository, str]] = {}
+        archived_repo_names = {repo.name for repo in self.archived_repos}
         for team_name, team_attrs in self.configured_teams.items():
             # Handle unset configured attributes
             if team_attrs is None:
@@ -709,7 +1216,7 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
 
             # Convert team name to Team object
             try:
-                team = self.org.get_team_by_slug(self._sluggify_teamname(team_name))
+                team = self._get_team_by_name(team_name)
             # Team not found, probably because a new team should be created, but it's a dry-run
             except UnknownObjectException:
                 logging.debug(
@@ -729,24 +1236,30 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
                 )
 
             # Get configured repo permissions
-            for repo, perm in team_attrs.get("repos", {}).items():
-                # Convert repo to Repo object
-                try:
-                    repo = self.org.get_repo(repo)
-                except UnknownObjectException:
-                    logging.warning(
-                        "Configured repository '%s' for team '%s' has not been "
-                        "found in the organisation",
-                        repo,
+            for repo_name, perm in team_attrs.get("repos", {}).items():
+                # Convert repo to Repo object, ideally from the known repos
+                if repo_name in archived_repo_names:
+                    logging.debug(
+                        "Ignoring configured repository '%s' for team '%s' as it is archived",
+                        repo_name,
                         team.name,
                     )
                     continue
+                if (repo := self.current_repos_by_name.get(repo_name)) is None:
+                    try:
+                        repo = self.org.get_repo(repo_name)
+                    except UnknownObjectException:
+                        logging.warning(
+                            "Configured repository '%s' for team '%s' has not been "
+                            "found in the organisation",
+                            repo_name,
+                            team.name,
+                        )
+                        continue
 
-                if perm != self.current_repos_teams[repo].get(team):
+                if perm != self.current_repos_teams.get(repo, {}).get(team):
                     # Add the changeset to the changelist
-                    if team not in team_changelist:
-                        team_changelist[team] = {}
-                    team_changelist[team][repo] = perm
+                    team_changelist.setdefault(team, {})[repo] = perm
 
         return team_changelist
 
@@ -755,29 +1268,27 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
     ) -> None:
         """Create a record of all members of a team and their permissions on a
         repo due to being member of an unconfigured team"""
-        users_of_unconfigured_team: dict[NamedUser, str] = self.current_teams[team].get(
+        users_of_unconfigured_team: dict[str, str] = self.current_teams[team].get(
             "members"
         )  # type: ignore
         # Initiate this repo in the dict as dict if not present
-        if repo_name not in self.unconfigured_team_repo_permissions:
-            self.unconfigured_team_repo_permissions[repo_name] = {}
-        # Add actual permission for each user of this unconfigured team
-        for user in users_of_unconfigured_team:
+        repo_permissions = self.unconfigured_team_repo_permissions.setdefault(repo_name, {})
+        # Add actual permission for each user (lower-cased login) of this
+        # unconfigured team
+        for login in users_of_unconfigured_team:
             # Handle if another, potentially higher permission is already set by
             # membership in another team
-            if exist_perm := self.unconfigured_team_repo_permissions[repo_name].get(user.login, ""):
+            if exist_perm := repo_permissions.get(login, ""):
                 logging.debug(
                     "Permissions for %s on %s already exist: %s. "
                     "Checking whether new permission is higher.",
-                    user.login,
+                    login,
                     repo_name,
                     exist_perm,
                 )
-                self.unconfigured_team_repo_permissions[repo_name][user.login] = (
-                    self._get_highest_permission(exist_perm, team_permission)
-                )
+                repo_permissions[login] = self._get_highest_permission(exist_perm, team_permission)
             else:
-                self.unconfigured_team_repo_permissions[repo_name][user.login] = team_permission
+                repo_permissions[login] = team_permission
 
     def sync_repo_permissions(self, dry: bool = False, ignore_archived: bool = False) -> None:
         """Synchronise the repository permissions of all teams"""
@@ -798,38 +1309,42 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
                 if not dry:
                     # Update permissions or newly add a team to a repo
                     team.update_team_repository(repo, perm)
+                    self.graphql_repos_collaborators_outdated = True
 
         # Find out whether repos' permissions contain *configured* teams that
         # should not have permissions
+        configured_teams = self.configured_teams
         for repo, teams in self.current_repos_teams.items():
-            for team in teams:
+            repo_name = repo.name
+            for team, team_permission in teams.items():
+                team_name = team.name
                 # Get configured repos for this team, finding out whether repo
                 # is configured for this team
                 remove = False
                 # Handle: Team is not configured at all
-                if team.name not in self.configured_teams:
+                if team_name not in configured_teams:
                     logging.warning(
                         "Team '%s' has permissions on repository '%s', but this team "
                         "is not configured locally",
-                        team.name,
-                        repo.name,
+                        team_name,
+                        repo_name,
                     )
                     # Store information about these team members and their
                     # permissions on the repo. We will use it later in the
                     # collaborators step
                     self._document_unconfigured_team_repo_permissions(
-                        team=team, team_permission=teams[team], repo_name=repo.name
+                        team=team, team_permission=team_permission, repo_name=repo_name
                     )
                     # Abort handling the repo sync as we don't touch unconfigured teams
                     continue
                 # Handle: Team is configured, but contains no config
-                if self.configured_teams[team.name] is None:
+                if (team_cfg := configured_teams[team_name]) is None:
                     remove = True
                 # Handle: Team is configured, contains config
-                elif repos := self.configured_teams[team.name].get("repos", []):  # type: ignore
+                elif repos := team_cfg.get("repos", []):
                     # If this repo has not been found in the configured repos
                     # for the team, remove all permissions
-                    if repo.name not in repos:
+                    if repo_name not in repos:
                         remove = True
                 # Handle: Team is configured, contains config, but no "repos" key
                 else:
@@ -837,37 +1352,37 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
 
                 # Remove if any mismatch has been found
                 if remove:
-                    logging.info("Removing team '%s' from repository '%s'", team.name, repo.name)
+                    logging.info("Removing team '%s' from repository '%s'", team_name, repo_name)
                     if not dry:
                         team.remove_from_repos(repo)
+                        self.graphql_repos_collaborators_outdated = True
 
     # --------------------------------------------------------------------------
     # Collaborators
     # --------------------------------------------------------------------------
     def _aggregate_lists(self, *lists: list[str | int]) -> list[str | int]:
         """Combine multiple lists into one while removing duplicates"""
-        complete = []
+        complete: set[str | int] = set()
         for single_list in lists:
             if single_list is not None:
-                complete.extend(single_list)
+                complete.update(single_list)
             else:
                 logging.debug(
                     "A list that we attempted to extend to another was None. "
                     "This probably happened because a 'member:' or 'maintainer:' key was left empty"
                 )
 
-        return list(set(complete))
+        return list(complete)
 
     def _get_highest_permission(self, *permissions: str) -> str:
         """Get the highest GitHub repo permissions out of multiple permissions"""
-        perms_ranking = ["admin", "maintain", "push", "triage", "pull"]
-        for perm in perms_ranking:
-            # If e.g. "maintain" matches one of the two permissions
-            if perm in permissions:
-                logging.debug("%s is the highest permission", perm)
-                return perm
+        highest = min(permissions, key=lambda perm: _PERM_RANK.get(perm, 99), default="")
+        # Unknown or no permissions at all
+        if not highest or highest not in _PERM_RANK:
+            return ""
 
-        return ""
+        logging.debug("%s is the highest permission", highest)
+        return highest
 
     def _get_direct_repo_permissions_of_team(self, team_dict: dict) -> tuple[dict[str, str], str]:
         """Get a list of directly configured repo permissions for a team, and
@@ -882,31 +1397,36 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
 
         return repo_perms, parent
 
-    def _get_all_repo_permissions_for_team_and_parents(self, team_name: str, team_dict: dict):
+    def _get_all_repo_permissions_for_team_and_parents(
+        self, team_name: str, team_dict: dict
+    ) -> dict[str, str]:
         """Get a list of all configured repo permissions for a team, also those
-        inherited by parent teams"""
+        inherited by parent teams. The result is cached per team, so that
+        common parents are only evaluated once"""
+        if team_name in self.configured_teams_repo_perms:
+            return self.configured_teams_repo_perms[team_name]
+
         all_repo_perms, parent = self._get_direct_repo_permissions_of_team(team_dict=team_dict)
-        # If parents have been found, iterate and merge them
-        while parent:
+        # If a parent has been found, get its (cached) permissions including
+        # its own parents, and merge them
+        if parent:
             logging.debug(
                 "Checking for repository permissions of %s's parent team %s", team_name, parent
             )
             parent_team_dict = self.configured_teams[parent]
 
             # Handle empty parent dict
-            if not parent_team_dict:
-                break
-
-            # Get repo permissions and potential parent, and add it
-            repo_perm, parent = self._get_direct_repo_permissions_of_team(
-                team_dict=parent_team_dict
-            )
-            for repo, perm in repo_perm.items():
-                # Add (highest) repo permission
-                all_repo_perms[repo] = self._get_highest_permission(
-                    perm, all_repo_perms.get(repo, "")
+            if parent_team_dict:
+                parent_repo_perms = self._get_all_repo_permissions_for_team_and_parents(
+                    parent, parent_team_dict
                 )
+                for repo, perm in parent_repo_perms.items():
+                    # Add (highest) repo permission
+                    all_repo_perms[repo] = self._get_highest_permission(
+                        perm, all_repo_perms.get(repo, "")
+                    )
 
+        self.configured_teams_repo_perms[team_name] = all_repo_perms
         return all_repo_perms
 
     def _get_configured_repos_and_user_perms(self):
@@ -917,36 +1437,35 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
         for team_name, team_attrs in self.configured_teams.items():
             logging.debug("Getting configured repository permissions for team %s", team_name)
             repo_perms = self._get_all_repo_permissions_for_team_and_parents(team_name, team_attrs)
-            for repo, perm in repo_perms.items():
-                # Create repo if non-exist
-                if repo not in self.configured_repos_collaborators:
-                    self.configured_repos_collaborators[repo] = {}
 
-                # Get team maintainers and members
-                team_members = self._aggregate_lists(
+            # Get team maintainers and members, lower-cased
+            team_members = {
+                team_member.lower()
+                for team_member in self._aggregate_lists(
                     team_attrs.get("maintainer", []), team_attrs.get("member", [])
                 )
+            }
+
+            for repo, perm in repo_perms.items():
+                # Create repo if non-exist
+                repo_collaborators = self.configured_repos_collaborators.setdefault(repo, {})
 
                 # Add team member to repo with their repo permissions
                 for team_member in team_members:
-                    # Lower-case team member
-                    team_member = team_member.lower()
                     # Check if permissions already exist
-                    if self.configured_repos_collaborators[repo].get(team_member, {}):
+                    if exist_perm := repo_collaborators.get(team_member, ""):
                         logging.debug(
                             "Permissions for %s on %s already exist: %s. "
                             "Checking whether new permission is higher.",
                             team_member,
                             repo,
-                            self.configured_repos_collaborators[repo][team_member],
+                            exist_perm,
                         )
-                        self.configured_repos_collaborators[repo][team_member] = (
-                            self._get_highest_permission(
-                                perm, self.configured_repos_collaborators[repo][team_member]
-                            )
+                        repo_collaborators[team_member] = self._get_highest_permission(
+                            perm, exist_perm
                         )
                     else:
-                        self.configured_repos_collaborators[repo][team_member] = perm
+                        repo_collaborators[team_member] = perm
 
     def _convert_graphql_perm_to_rest(self, permission: str) -> str:
         """Convert a repo permission coming from the GraphQL API to the ones
@@ -969,99 +1488,96 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
         """Get all collaborators (individuals) of all repos of a GitHub
         organization with their permissions using the GraphQL API"""
 
-        graphql_query = """
-            query($owner: String!, $cursor: String) {
-                organization(login: $owner) {
-                    repositories(first: 100, after: $cursor) {
-                        edges {
-                            node {
-                                name
-                                collaborators(first: 100) {
-                                    edges {
-                                        node {
-                                            login
-                                        }
-                                        permission
-                                    }
-                                    pageInfo {
-                                        endCursor
-                                        hasNextPage
-                                    }
-                                }
-                            }
-                        }
-                        pageInfo {
-                            endCursor
-                            hasNextPage
-                        }
-                    }
-                }
-            }
-        """
-
-        # Initial query parameters for org-level request
-        variables = {"owner": self.org.login, "cursor": None}
-
-        # dict in which we store repos for which there are more than 100
-        # collaborators, and their respective end cursors
-        next_page_cursors_for_repos: dict[str, str] = {}
-
-        more_repos_in_org = True
-        while more_repos_in_org:
+        # The first 100 collaborators of each repo have usually been fetched
+        # together with the team permissions. Only request them again if team
+        # permissions have been changed in the meantime
+        if self.graphql_repos_collaborators_outdated:
             logging.debug("Requesting collaborators for %s", self.org.login)
-            org_result = run_graphql_query(graphql_query, variables, self.gh_token)
-            more_repos_in_org, variables["cursor"] = self._extract_data_from_graphql_response(
-                graphql_response=org_result, next_page_cursors_for_repos=next_page_cursors_for_repos
-            )
+            self._fetch_permissions_of_organization(with_teams=False)
+
+        next_page_cursors_for_repos = self.graphql_repos_collaborators_cursors
 
         # If there are more than 100 collaborators in a repo, we need to fetch
-        # rest via individual GraphQL queries
+        # the rest via additional GraphQL queries, each covering multiple repos
         if next_page_cursors_for_repos:
             logging.debug(
                 "Not all collaborators of all repos have been fetched. Missing data: %s",
                 next_page_cursors_for_repos,
             )
-            for repo_name, end_cursor in next_page_cursors_for_repos.items():
-                more_collaborators_in_repo = True
-                while more_collaborators_in_repo:
-                    logging.debug("Requesting additional collaborators for repo %s", repo_name)
-                    # Initial query parameters for repo-level request
-                    repo_variables = {
-                        "owner": self.org.login,
-                        "repo": repo_name,
-                        "cursor": end_cursor,
-                    }
-                    repo_query = """
-                        query($owner: String!, $repo: String!, $cursor: String) {
-                            repository(owner: $owner, name: $repo) {
-                                collaborators(first: 100, after: $cursor) {
-                                    edges {
-                                        node {
-                                            login
-                                        }
-                                        permission
-                                    }
-                                    pageInfo {
-                                        endCursor
-                                        hasNextPage
-                                    }
-                                }
-                            }
-                        }
-                    """
-                    repo_result = run_graphql_query(repo_query, repo_variables, self.gh_token)
-                    more_collaborators_in_repo, end_cursor = (
-                        self._extract_data_from_graphql_response(
-                            graphql_response=repo_result,
-                            next_page_cursors_for_repos=next_page_cursors_for_repos,
-                            single_repo_name=repo_name,
-                        )
-                    )
+            # Run the independent queries in parallel. Each query only touches
+            # its own repos
+            remaining_cursors = dict(next_page_cursors_for_repos)
+            batch_size = _REPOS_PER_COLLABORATORS_QUERY
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                while remaining_cursors:
+                    repo_names = list(remaining_cursors)
+                    batches = [
+                        {name: remaining_cursors[name] for name in repo_names[i : i + batch_size]}
+                        for i in range(0, len(repo_names), batch_size)
+                    ]
+                    remaining_cursors = {}
+                    for more_cursors in executor.map(
+                        self._fetch_more_collaborators_of_repos, batches
+                    ):
+                        remaining_cursors.update(more_cursors)
 
         # All collaborators from all repos have been fetched, now populate the
         # actual dictionary
         self._populate_current_repos_collaborators()
 
+    def _fetch_more_collaborators_of_repos(self, end_cursors: dict[str, str]) -> dict[str, str]:
+        """Fetch the next page of collaborators of multiple repos in a single
+        GraphQL query by using aliases. Returns the end cursors of the repos
+        which have even more collaborators"""
+        variable_definitions = ["$owner: String!"]
+        repo_queries = []
+        variables: dict[str, str] = {"owner": self.org.login}
+        aliases: dict[str, str] = {}
+        for idx, (repo_name, end_cursor) in enumerate(end_cursors.items()):
+            variable_definitions.append(f"$repo{idx}: String!, $cursor{idx}: String")
+            repo_queries.append(f"""
+                repo{idx}: repository(owner: $owner, name: $repo{idx}) {{
+                    collaborators(first: 100, after: $cursor{idx}) {{
+                        edges {{
+                            node {{
+                                login
+                            }}
+                            permission
+                        }}
+                        pageInfo {{
+                            endCursor
+                            hasNextPage
+                        }}
+                    }}
+                }}""")
+            variables[f"repo{idx}"] = repo_name
+            variables[f"cursor{idx}"] = end_cursor
+            aliases[f"repo{idx}"] = repo_name
+
+        repo_queries.append("""
+                rateLimit {
+                    cost
+                    remaining
+                    resetAt
+                }""")
+        repos_query = f"query({', '.join(variable_definitions)}) {{{''.join(repo_queries)}\n}}"
+
+        logging.debug("Requesting additional collaborators for repos %s", list(end_cursors))
+        repos_result = run_graphql_query(repos_query, variables, self.gh_token)
+
+        # Extract the collaborators of each repo like for a single repo query
+        more_cursors: dict[str, str] = {}
+        for alias, repo_name in aliases.items():
+            more_collaborators_in_repo, end_cursor = self._extract_data_from_graphql_response(
+                graphql_response={"data": {"repository": repos_result["data"][alias]}},
+                next_page_cursors_for_repos={},
+                single_repo_name=repo_name,
+            )
+            if more_collaborators_in_repo:
+                more_cursors[repo_name] = end_cursor
+
+        return more_cursors
+
     def _extract_data_from_graphql_response(
         self,
         graphql_response: dict,
@@ -1123,10 +1639,21 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
                     )
                     sys.exit(1)
 
+                # Skip repos without any direct collaborators. All permissions
+                # come from teams or the organization then, which cannot be
+                # removed via the collaborators anyway
+                direct_collaborators = repo_edges["node"].get("directCollaborators") or {}
+                if direct_collaborators.get("totalCount") == 0:
+                    logging.debug("Repo %s does not have any direct collaborators", repo_name)
+                    self.graphql_repos_collaborators[repo_name] = {}
+                    continue
+
                 # fill in collaborators of repo
+                self.graphql_repos_collaborators[repo_name] = {}
                 try:
-                    repo_collaborators = repo_edges["node"]["collaborators"]["edges"]
-                    self.graphql_repos_collaborators[repo_name] = repo_collaborators
+                    self._add_graphql_collaborators(
+                        repo_name, repo_edges["node"]["collaborators"]["edges"]
+                    )
                 except (TypeError, KeyError):
                     logging.debug("Repo %s does not seem to have any collaborators", repo_name)
 
@@ -1154,10 +1681,10 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
 
             # fill in collaborators of repo
             try:
-                repo_collaborators = graphql_response["data"]["repository"]["collaborators"][
-                    "edges"
-                ]
-                self.graphql_repos_collaborators[single_repo_name].extend(repo_collaborators)
+                self._add_graphql_collaborators(
+                    single_repo_name,
+                    graphql_response["data"]["repository"]["collaborators"]["edges"],
+                )
             except (TypeError, KeyError):
                 logging.debug("Repo %s does not seem to have any collaborators", single_repo_name)
 
@@ -1167,18 +1694,24 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
         logging.debug("GraphQL response: %s", graphql_response)
         return False, ""
 
+    def _add_graphql_collaborators(self, repo_name: str, collaborators: list[dict]) -> None:
+        """Add collaborators of a repo from a page of a GraphQL response with
+        their lower-cased login and REST-style permission. Only this data is
+        kept, not the whole response"""
+        repo_collaborators = self.graphql_repos_collaborators.setdefault(repo_name, {})
+        for collaborator in collaborators:
+            login: str = collaborator["node"]["login"].lower()
+            # Skip entry if collaborator is org owner, which is "admin" anyway
+            if login in self.current_org_owner_logins:
+                continue
+            repo_collaborators[login] = self._convert_graphql_perm_to_rest(
+                collaborator["permission"]
+            )
+
     def _populate_current_repos_collaborators(self) -> None:
         """Populate self.current_repos_collaborators with data from repo_collaborators"""
         for repo, collaborators in self.current_repos_collaborators.items():
-            if repo.name in self.graphql_repos_collaborators:
-                # Extract each collaborator from the GraphQL response for this repo
-                for collaborator in self.graphql_repos_collaborators[repo.name]:
-                    login: str = collaborator["node"]["login"]
-                    # Skip entry if collaborator is org owner, which is "admin" anyway
-                    if login.lower() in [user.login.lower() for user in self.current_org_owners]:
-                        continue
-                    permission = self._convert_graphql_perm_to_rest(collaborator["permission"])
-                    collaborators[login.lower()] = permission
+            collaborators.update(self.graphql_repos_collaborators.get(repo.name, {}))
 
     def _get_current_repos_and_user_perms(self):
         """Get all repos, their current collaborators and their permissions"""
@@ -1197,17 +1730,13 @@ class GHorg:  # pylint: disable=too-many-instance-attributes, too-many-lines
 
     def _permission1_higher_than_permission2(self, permission1: str, permission2: str) -> bool:
         """Check whether permission 1 is higher than permission 2"""
-        perms_ranking = ["admin", "maintain", "push", "triage", "pull", ""]
-
-        def get_rank(permission):
-            return perms_ranking.index(permission) if permission in perms_ranking else 99
-
-        rank_permission1 = get_rank(permission1)
-        rank_permission2 = get_rank(permission2)
+        # Identical permissions are the most common case
+        if permission1 == permission2:
+            return False
 
-        # The lower the index, the higher the permission. If lower than
+        # The lower the rank, the higher the permission. If lower than
         # permission2, return True
-        return rank_permission1 < rank_permission2
+        return _PERM_RANK.get(permission1, 99) < _PERM_RANK.get(permission2, 99)
 
     def sync_repo_collaborator_permissions(self, dry: bool = False):
         """Compare the configured with the current repo permissions for all
@@ -13,6 +13,18 @@ from ._config import parse_config_files
 from ._gh_org import GHorg
 from ._setup_team import setup_team
 
+
+def _positive_int(value: str) -> int:
+    """Argparse type for integers that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"'{value}' is not an integer") from exc
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a positive integer")
+    return number
+
+
 # Main parser with root-level flags
 parser = argparse.ArgumentParser(
     description=__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -53,6 +65,12 @@ parser_sync.add_argument(
     action="store_true",
     help="Execute potentially dangerous actions which you will be warned about without this flag",
 )
+parser_sync.add_argument(
+    "--concurrency",
+    type=_positive_int,
+    default=8,
+    help="Maximum number of parallel requests to the GitHub API",
+)
 
 # Setup Team
 parser_create_team = subparsers.add_parser(
@@ -97,7 +115,7 @@ def main():
         if args.force:
             logging.info("Force mode activated, will make potentially dangerous actions")
 
-        org = GHorg()
+        org = GHorg(concurrency=args.concurrency)
 
         # Parse configuration folder, and do sanity check
         cfg_org, cfg_app, org.configured_teams = parse_config_files(args.config)
@@ -137,8 +155,9 @@ def main():
         # from team membership (or if they are in no configured team at all)
         org.sync_repo_collaborator_permissions(dry=args.dry)
 
-        # Debug output
-        logging.debug("Final dataclass:\n%s", org.pretty_print_dataclass())
+        # Debug output. Only build it if it is actually logged
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Final dataclass:\n%s", org.pretty_print_dataclass())
         org.ratelimit()
 
     # Setup Team command